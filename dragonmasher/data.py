@@ -25,11 +25,16 @@ def mash(*args, **kwargs):
         if not (isinstance(arg, dict) or isinstance(arg, BaseSource)):
             raise TypeError("arguments must be of type dict or BaseSource.")
 
-    mashed = {}
-    first_mash = True
-    for arg in args:
-        if isinstance(arg, BaseSource):
-            arg = arg.data
-        update_dict(mashed, arg, annotate=False if first_mash else annotate)
-        first_mash = False
+    sources = [arg.data if isinstance(arg, BaseSource) else arg
+               for arg in args]
+    # There is nothing to merge the first source with, so its values are
+    # copied directly.
+    mashed = dict((key, dict(value)) for key, value in sources[0].items())
+    if annotate:
+        # Only the first source's keys are kept, so look those keys up in the
+        # other sources instead of walking all of their data.
+        sources[1:] = [dict((k, s[k]) for k in mashed if k in s)
+                       for s in sources[1:]]
+    for source in sources[1:]:
+        update_dict(mashed, source)
     return mashed
@@ -2,34 +2,48 @@
 """Chinese data source classes and methods."""
 
 from __future__ import unicode_literals
+import codecs
 import contextlib
+import io
 import logging
+import multiprocessing
+import operator
 import os
+import pickle
 import pkgutil
 import re
 import shutil
 import sys
 import tempfile
+import threading
 
 is_python3 = sys.version_info[0] > 2
 is_python2 = not is_python3
 
 if is_python3:
     import csv
-    from urllib.request import urlopen
+    from http.client import HTTPException
+    from sys import intern
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
 else:
     from codecs import open
-    from urllib2 import urlopen
+    from httplib import HTTPException
+    from urllib2 import HTTPError, Request, urlopen
 
     from . import unicodecsv as csv
 
+    def intern(string):
+        """Python 2's intern() only accepts byte strings."""
+        return string
+
 from dragonmapper import transcriptions
 from fcache.cache import FileCache
 from ticktock import TimeoutShelf
 import zhon.hanzi
 
 from dragonmasher.unpack import unpack_archive
-from dragonmasher.utils import hex_to_chr, trim_list, update_dict
+from dragonmasher.utils import hex_to_chr, trim_list, trimmer, update_dict
 
 logger = logging.getLogger(__name__)
 
@@ -38,10 +52,155 @@ PACKAGE = __name__.rpartition('.')[0]
 #: The default timeout value for cached data (in seconds).
 DEFAULT_TIMEOUT = 12096000
 
+# The number of bytes to copy at a time when saving downloaded files.
+_CHUNK_SIZE = 64 * 1024
+
+# How many times an interrupted download is resumed before giving up.
+_DOWNLOAD_RETRIES = 3
+
+# Regular expressions used for every line or row of the larger sources.
+_CEDICT_LINE_RE = re.compile(
+    r'^(?P<t>.+) (?P<s>.+) \[(?P<p>.+)\] /(?P<d>.+)/$')
+_CEDICT_PINYIN_RE = re.compile(r'(?:[a-zA-Z]+[1-5](?: (?=[a-zA-Z]+[1-5]))?)+')
+_CEDICT_BRACKET_RE = re.compile(r'\[[A-Za-z1-5 ]+\]')
+_CJK_IDEOGRAPH_RE = re.compile('[%s]' % zhon.hanzi.cjk_ideographs)
+_UNICODE_POINT_RE = re.compile(r'U\+[A-F0-9]+')
+
+# Accented Pinyin keyed by the numbered Pinyin it was converted from, and the
+# most conversions kept before it is cleared. See _numbered_to_accented().
+_accented_pinyin = {}
+_ACCENTED_PINYIN_CACHE_SIZE = 100000
+
+# The source whose files are being processed by a pool of worker processes.
+# The workers are forked, so they inherit it instead of unpickling a copy.
+# See _process_files_in_pool(). The lock keeps threads, e.g. those started by
+# download_all(), from replacing it while a pool is running.
+_pool_source = None
+_pool_lock = threading.Lock()
+
+# Processed package resource data and the keys of its rows that contain lists,
+# keyed by source class, files, encoding and key prefix. See
+# BasePackageResourceSource.read().
+_resource_data = {}
+
+
+def _copy_data(data, list_keys):
+    """Returns a copy of *data* that shares none of its dicts or lists.
+
+    :param dict data: The processed data to copy.
+    :param tuple list_keys: The keys of the rows in *data* that contain lists.
+        The other rows only contain strings, so they are copied shallowly.
+
+    """
+    copy = dict((key, value.copy()) for key, value in data.items())
+    for key in list_keys:
+        value = copy[key]
+        for k, v in value.items():
+            if isinstance(v, list):
+                value[k] = v[:]
+    return copy
+
+
+def _merge_data(data, other):
+    """Merges the processed data *other* into *data* and returns the result.
+
+    :func:`~dragonmasher.utils.update_dict` is only needed when the two share
+    keys; otherwise *other* is used or added directly.
+
+    """
+    if not data:
+        return other
+    elif any(key in data for key in other):
+        update_dict(data, other)
+    else:
+        data.update(other)
+    return data
+
+
+def _process_pool_file(filename):
+    """Reads and processes *filename* in a worker process."""
+    return _pool_source._read_and_process_file(filename)
+
+
+def _process_files_in_pool(source, files, processes):
+    """Reads and processes *source*'s *files* in a pool of processes.
+
+    :return: A list of each file's processed data, in the order of *files*.
+
+    """
+    global _pool_source
+    if is_python3:
+        # Python 3 may spawn workers instead, which wouldn't inherit *source*.
+        Pool = multiprocessing.get_context('fork').Pool
+    else:
+        Pool = multiprocessing.Pool
+    with _pool_lock:
+        _pool_source = source
+        try:
+            pool = Pool(processes)
+            try:
+                return pool.map(_process_pool_file, files, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _pool_source = None
+
+
+def _numbered_to_accented(pinyin):
+    """Converts numbered Pinyin to accented Pinyin, reusing earlier results.
+
+    CC-CEDICT repeats the same readings (e.g. ``'[ge4]'``) many times, so
+    each conversion by :func:`dragonmapper.transcriptions.numbered_to_accented`
+    is remembered.
+
+    """
+    accented = _accented_pinyin.get(pinyin)
+    if accented is None:
+        if len(_accented_pinyin) >= _ACCENTED_PINYIN_CACHE_SIZE:
+            _accented_pinyin.clear()
+        accented = transcriptions.numbered_to_accented(pinyin)
+        _accented_pinyin[pinyin] = accented
+    return accented
+
+
+def _join_syllables(match):
+    """Removes the spaces between the numbered Pinyin syllables in *match*."""
+    return match.group(0).replace(' ', '')
+
+
+def _accent_bracketed_pinyin(match):
+    """Converts the bracketed numbered Pinyin in *match* to accented Pinyin."""
+    pinyin = match.group(0)
+    if ' ' in pinyin:
+        pinyin = _CEDICT_PINYIN_RE.sub(_join_syllables, pinyin)
+    return _numbered_to_accented(pinyin)
+
 
 class BaseSource(object):
     """Base class for Chinese data sources."""
 
+    # Child classes can set data before calling __init__(), e.g. to use cached
+    # data; otherwise an empty dictionary is created.
+    data = None
+
+    #: A tuple containing the paths to the source's files.
+    files = None
+
+    #: A string containing the name/abbreviation for this source.
+    name = None
+
+    #: Whether or not :meth:`read_file` should return an open file object
+    #: instead of the file's contents. This lets :meth:`process_file` iterate
+    #: over large files line by line instead of reading them into memory.
+    stream_files = False
+
+    #: The number of processes to use when reading and processing the
+    #: source's files. If greater than ``1``, the files are processed in a pool
+    #: of forked worker processes and their data is merged in this process.
+    #: Platforms that can't fork process the files one at a time.
+    processes = 1
+
     def __init__(self, encoding='utf-8'):
         """Sets up instance variables.
 
@@ -50,17 +209,11 @@ class BaseSource(object):
 
         """
         #: A dictionary containing the processed source data.
-        self.data = self.data if hasattr(self, 'data') else {}
+        self.data = {} if self.data is None else self.data
 
         #: The file encoding to use when opening the source's files.
         self.encoding = encoding
 
-        #: A tuple containing the paths to the source's files.
-        self.files = self.files if hasattr(self, 'files') else None
-
-        #: A string containing the name/abbreviation for this source.
-        self.name = self.name if hasattr(self, 'name') else None
-
         super(BaseSource, self).__init__()
 
     @property
@@ -74,14 +227,41 @@ class BaseSource(object):
         The processed data is stored in :attr:`data`.
 
         For each file to be read and processed, this method calls
-        :meth:`read_file` and :meth:`process_file`.
+        :meth:`read_file` and :meth:`process_file`. If :meth:`read_file`
+        returns an open file object, it is closed once it has been processed.
+        See :attr:`processes` for processing the files in parallel.
+
+        """
+        for data in self._process_files(self.files):
+            if data is not None:
+                self.data = _merge_data(self.data, data)
+
+    def _process_files(self, files):
+        """Reads and processes *files* without changing :attr:`data`.
+
+        :return: An iterable of each file's processed data (:data:`None` for
+            files that were ignored).
+
+        """
+        processes = min(self.processes, len(files))
+        if processes > 1 and hasattr(os, 'fork'):
+            return _process_files_in_pool(self, files, processes)
+        return (self._read_and_process_file(f) for f in files)
+
+    def _read_and_process_file(self, filename):
+        """Reads and processes a single file without changing :attr:`data`.
+
+        :return: The processed data (:data:`None` if the file was ignored).
 
         """
-        for filename in self.files:
-            contents = self.read_file(filename)
-            if contents is not None:
-                data = self.process_file(filename, contents)
-                update_dict(self.data, data)
+        contents = self.read_file(filename)
+        if contents is None:
+            return None
+        try:
+            return self.process_file(filename, contents)
+        finally:
+            if hasattr(contents, 'close'):
+                contents.close()
 
     def read_file(self, filename):
         """Reads a source file's contents.
@@ -96,6 +276,22 @@ class BaseSource(object):
         """
         raise NotImplemented
 
+    def open_file(self, filename):
+        """Opens a source file so that it can be read line by line.
+
+        This is used by :meth:`read_file` when :attr:`stream_files` is
+        ``True``. On Python 2, the :mod:`csv` module needs UTF-8 encoded lines,
+        so UTF-8 files are opened in binary mode instead of being decoded and
+        then encoded again.
+
+        :param str filename: The filename of the file to be opened.
+        :return: An open file object.
+
+        """
+        if is_python2 and codecs.lookup(self.encoding).name == 'utf-8':
+            return io.open(filename, 'rb')
+        return io.open(filename, 'r', encoding=self.encoding, newline='')
+
     def process_file(self, filename, contents):
         """Processes a source file's contents.
 
@@ -130,15 +326,46 @@ class BaseLocalSource(BaseSource):
 class BasePackageResourceSource(BaseLocalSource):
     """Base class for Chinese data sources that are package resources."""
 
+    def read(self):
+        """Reads and processes the source's package resources.
+
+        The processed data is stored in :attr:`data`.
+
+        Package resources don't change while the program is running, so the
+        processed data is kept for the rest of the process. Later instances
+        of the same source get a copy of it instead of reading and processing
+        the resources again.
+
+        """
+        key = (type(self), tuple(self.files), self.encoding, self.key_prefix)
+        if key not in _resource_data:
+            data = {}
+            for file_data in self._process_files(self.files):
+                if file_data is not None:
+                    data = _merge_data(data, file_data)
+            list_keys = tuple(k for k, v in data.items() if
+                              any(isinstance(x, list) for x in v.values()))
+            _resource_data[key] = (data, list_keys)
+        self.data = _merge_data(self.data, _copy_data(*_resource_data[key]))
+
     def read_file(self, resource):
         """Reads a package resource's contents.
 
+        If :attr:`stream_files` is ``True`` and the resource is a file on disk
+        (i.e. the package isn't zipped), the file is opened and returned
+        instead of being read and decoded all at once.
+
         :param str resource: The relative filename of the resource.
         :return: The resource's contents.
-        :rtype: :class:`str`
+        :rtype: :class:`str` or file object
 
         """
         logger.debug("Opening package resource for reading: '%s'." % resource)
+        if self.stream_files:
+            filename = os.path.join(os.path.dirname(__file__),
+                                    *resource.split('/'))
+            if os.path.isfile(filename):
+                return self.open_file(filename)
         return pkgutil.get_data(PACKAGE, resource).decode(self.encoding)
 
 
@@ -185,17 +412,27 @@ class BaseRemoteSource(BaseSource):
         super(BaseRemoteSource, self).__init__(encoding=encoding)
 
     def _init_cache(self, cache_name, timeout):
-        """Opens a cache for the processed source data."""
+        """Opens a cache for the processed source data.
+
+        The cache doesn't use writeback, so the processed data is only
+        serialized when :meth:`read` stores it, not every time the cache is
+        synced or closed. It is pickled with the highest protocol available,
+        which is much smaller and faster to load than the shelf's default
+        protocol (especially on Python 2, where the default is text-based).
+
+        """
         fcache = FileCache(cache_name, serialize=False)
-        self.cache = TimeoutShelf(fcache, writeback=True, timeout=timeout)
-        self.data = self.cache.setdefault(self.name, {})
+        self.cache = TimeoutShelf(fcache, protocol=pickle.HIGHEST_PROTOCOL,
+                                  timeout=timeout)
+        self.data = self.cache.get(self.name, {})
 
     def _reset_cache(self):
         """Deletes the cached data."""
         del self.data
-        del self.cache[self.name]
-        self.cache.sync()
-        self.data = self.cache.setdefault(self.name, {})
+        if self.name in self.cache:
+            del self.cache[self.name]
+            self.cache.sync()
+        self.data = {}
 
     @property
     def has_data(self):
@@ -251,12 +488,37 @@ class BaseRemoteSource(BaseSource):
         self.files = (abs_fname,)
 
     def _download(self, url, filename):
-        """Opens *url* and saves it to *filename*."""
-        logger.debug("Opening the URL: '%s'." % url)
-        with contextlib.closing(urlopen(self.download_url)) as page:
-            with open(filename, 'wb') as f:
-                logger.debug("Saving file: '%s'." % filename)
-                f.write(page.read())
+        """Opens *url* and saves it to *filename*.
+
+        If the connection is lost part way through, the download is resumed
+        using an HTTP Range request. If the server doesn't honor the range,
+        the file is downloaded again from the start.
+
+        """
+        with open(filename, 'wb') as f:
+            logger.debug("Saving file: '%s'." % filename)
+            retries = 0
+            while True:
+                request = Request(url)
+                position = f.tell()
+                if position:
+                    request.add_header('Range', 'bytes=%d-' % position)
+                logger.debug("Opening the URL: '%s'." % url)
+                try:
+                    with contextlib.closing(urlopen(request)) as page:
+                        if position and page.getcode() != 206:
+                            f.seek(0)
+                            f.truncate()
+                        shutil.copyfileobj(page, f, _CHUNK_SIZE)
+                    return
+                except HTTPError:
+                    raise
+                except (EnvironmentError, HTTPException) as e:
+                    retries += 1
+                    if retries > _DOWNLOAD_RETRIES:
+                        raise
+                    logger.warning("Download interrupted, resuming from byte "
+                                   "%d: %s" % (f.tell(), e))
 
     def read(self):
         """Reads and processes the source's files.
@@ -274,8 +536,11 @@ class BaseRemoteSource(BaseSource):
 
         super(BaseRemoteSource, self).read()
 
-        if self.cache_data:
+        # There is nothing worth pickling if no data was processed (e.g. every
+        # file was ignored); has_data would treat it as missing anyway.
+        if self.cache_data and self.has_data:
             logger.debug("Writing processed data to cache.")
+            self.cache[self.name] = self.data
             self.cache.sync()
 
         self._cleanup()
@@ -285,11 +550,14 @@ class BaseRemoteSource(BaseSource):
 
         :param str filename: The filename of the file to be read.
         :return: The resource's contents (:data:`None` if no contents are to be
-            retured, e.g. the file was ignored).
-        :rtype: :class:`str` or :data:`None`
+            retured, e.g. the file was ignored). If :attr:`stream_files` is
+            ``True``, an open file object is returned instead.
+        :rtype: :class:`str`, file object, or :data:`None`
 
         """
         logger.debug("Opening file for reading: '%s'." % filename)
+        if self.stream_files:
+            return self.open_file(filename)
         with open(filename, 'r', encoding=self.encoding) as f:
             return f.read()
 
@@ -347,7 +615,10 @@ class BaseRemoteArchiveSource(BaseRemoteSource):
         if not self.has_files:
             raise OSError("Download was not successful, no files to extract.")
         logger.debug("Unpacking archive file: '%s'." % self.files[0])
-        unpack_archive(self.files[0], self.temp_dir)
+        # Files that aren't whitelisted would be ignored, so they aren't
+        # written to disk.
+        names = self.whitelist if len(self.whitelist) > 0 else None
+        unpack_archive(self.files[0], self.temp_dir, names=names)
         os.remove(self.files[0])
         _files = os.listdir(self.temp_dir)
         self.files = tuple([os.path.join(self.temp_dir, f) for f in _files])
@@ -357,8 +628,9 @@ class BaseRemoteArchiveSource(BaseRemoteSource):
 
         :param str filename: The filename of the file to be read.
         :return: The resource's contents (:data:`None` if no contents are to be
-            retured, e.g. the file was ignored).
-        :rtype: :class:`str` or :data:`None`
+            retured, e.g. the file was ignored). If :attr:`stream_files` is
+            ``True``, an open file object is returned instead.
+        :rtype: :class:`str`, file object, or :data:`None`
 
         """
         basename = os.path.basename(filename)
@@ -366,6 +638,8 @@ class BaseRemoteArchiveSource(BaseRemoteSource):
             logger.debug("Ignoring file: '%s'." % filename)
             return None
         logger.debug("Opening file for reading: '%s'." % filename)
+        if self.stream_files:
+            return self.open_file(filename)
         with open(filename, 'r', encoding=self.encoding) as f:
             return f.read()
 
@@ -399,12 +673,16 @@ class CSVMixin(object):
     #: (counting from zero).
     index_column = 0
 
+    # Prefixed headers shared by every instance; see get_headers().
+    _prefixed_headers = {}
+
     def process_file(self, filename, contents, delimiter=',', comments=('#',),
                      exclude=()):
         """Processes a CSV file's contents.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :param str delimiter: The field delimiter (defaults to ``','``).
         :param tuple comments: A sequence of one-character strings that are
             used to designate a line as a comment (defaults to ``('#',)``.
@@ -417,29 +695,96 @@ class CSVMixin(object):
         logger.debug("Processing file: '%s'." % filename)
         excluded_columns = exclude + (self.index_column,)
         data = {}
-        headers = trim_list(self.headers, excluded_columns)
-        if is_python2:
-            contents = contents.encode('utf-8')
-        rows = self.get_rows(contents.splitlines(), delimiter=delimiter)
+        # Columns like levels and parts of speech repeat the same few values,
+        # so equal values share a single string object.
+        share = {}.setdefault
+        headers = self.get_headers(excluded_columns)
+        trim = trimmer(len(self.headers), excluded_columns)
+        rows = self.get_rows(self.get_lines(contents), delimiter=delimiter)
+        # Bind the attributes used for every row to locals.
+        process_row, index_column = self.process_row, self.index_column
+        if type(self).process_row == CSVMixin.process_row:
+            # The default only skips comments, so check for them inline
+            # instead of calling it for every row.
+            process_row = None
         for row in rows:
-            prow = self.process_row(row, comments)
-            if prow is None:
+            if process_row is None:
+                skip = not row or row[0].startswith(comments)
+            else:
+                skip = process_row(row, comments) is None
+            if skip:
                 logger.debug("Skipping row: '%s'" % row)
                 continue
-            key = row[self.index_column]
-            trow = trim_list(row, excluded_columns)
-            value = dict(zip([self.key_prefix + h for h in headers], trow))
-            update_dict(data, {key: value})
+            key = row[index_column]
+            try:
+                trow = trim(row)
+            except IndexError:
+                trow = trim_list(row, excluded_columns)  # A short row.
+            value = dict(zip(headers, map(share, trow, trow)))
+            if key in data:
+                update_dict(data, {key: value})
+            else:
+                data[key] = value
         return data
 
+    def get_headers(self, excluded_columns=()):
+        """Returns the prefixed headers of the columns that aren't excluded.
+
+        Each header is prepended with :data:`BaseSource.key_prefix` and
+        interned, so every row's dictionary shares the same key objects. The
+        headers are built once and then reused by later calls, including calls
+        made by other instances with the same key prefix and headers.
+
+        :param tuple excluded_columns: A sequence of column numbers to exclude
+            (counting from zero).
+        :rtype: :class:`tuple`
+
+        """
+        key_prefix = self.key_prefix
+        key = (key_prefix, tuple(self.headers), tuple(excluded_columns))
+        headers = self._prefixed_headers.get(key)
+        if headers is None:
+            headers = tuple(intern(key_prefix + h) for h in
+                            trim_list(self.headers, excluded_columns))
+            self._prefixed_headers[key] = headers
+        return headers
+
+    def get_lines(self, contents):
+        """Returns an iterable of the lines in *contents*.
+
+        *contents* can be a string or an open file object. Strings are wrapped
+        in :class:`io.StringIO` so that their lines are produced lazily instead
+        of being split into a list up front. On Python 2, the lines are encoded
+        as UTF-8 unless the file was opened in binary mode by
+        :meth:`BaseSource.open_file`.
+
+        """
+        if isinstance(contents, io.BufferedIOBase):
+            return contents
+        if hasattr(contents, 'read'):
+            lines = contents
+        else:
+            lines = io.StringIO(contents, newline='')
+        if is_python2:
+            lines = (line.encode('utf-8') for line in lines)
+        return lines
+
     def get_rows(self, csvfile, delimiter=','):
+        """Returns a CSV reader for the lines in *csvfile*.
+
+        Tab-delimited files are read without quoting. Their fields aren't
+        quoted, but some of them start with a quote character (e.g.
+        SUBTLEX-CH's English definitions).
+
+        """
         if is_python2 and not isinstance(delimiter, str):
             delimiter = delimiter.encode('utf-8')
-        return csv.reader(csvfile, delimiter=delimiter)
+        quoting = csv.QUOTE_NONE if delimiter == '\t' else csv.QUOTE_MINIMAL
+        return csv.reader(csvfile, delimiter=delimiter, quoting=quoting)
 
     def process_row(self, row, comments):
         """Processes the fields in *row*."""
-        if row[0][0] in comments:
+        if not row or row[0].startswith(comments):
             return None
         return row
 
@@ -461,6 +806,9 @@ class HSK(CSVMixin, BasePackageResourceSource):
     #: A unique name/abbreviation for this source.
     name = 'HSK'
 
+    #: Whether or not :meth:`read_file` should return an open file object.
+    stream_files = True
+
     def __init__(self):
         super(HSK, self).__init__(encoding='utf-8')
 
@@ -490,6 +838,9 @@ class TOCFL(CSVMixin, BasePackageResourceSource):
     #: A unique name/abbreviation for this source.
     name = 'TOCFL'
 
+    #: Whether or not :meth:`read_file` should return an open file object.
+    stream_files = True
+
     def __init__(self):
         super(TOCFL, self).__init__(encoding='utf-8')
 
@@ -519,6 +870,9 @@ class XianDaiChangYongZi(CSVMixin, BasePackageResourceSource):
     #: A unique name/abbreviation for this source.
     name = 'XDCYZ'
 
+    #: Whether or not :meth:`read_file` should return an open file object.
+    stream_files = True
+
     def __init__(self):
         super(XianDaiChangYongZi, self).__init__(encoding='utf-8')
 
@@ -572,6 +926,9 @@ class SUBTLEX(CSVMixin, BaseRemoteArchiveSource):
         'SUBTLEX_CH_131210_CE.utf8',
     )
 
+    #: The SUBTLEX-CH file is large, so it is processed line by line.
+    stream_files = True
+
     def __init__(self, cache_data=True, cache_name='dragonmasher',
                  timeout=DEFAULT_TIMEOUT):
         super(SUBTLEX, self).__init__(cache_data=cache_data,
@@ -604,7 +961,8 @@ class SUBTLEX(CSVMixin, BaseRemoteArchiveSource):
         """Processes the SUBTLEX-CH word and word frequency data.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :return: The processed data.
         :rtype: :class:`dict`
 
@@ -615,27 +973,40 @@ class SUBTLEX(CSVMixin, BaseRemoteArchiveSource):
         logger.debug("Processing file: '%s'." % filename)
         excluded_columns = exclude + (self.index_column,)
         data = {}
-        headers = trim_list(self.headers, excluded_columns)
-        if is_python2:
-            contents = contents.encode('utf-8')
-        rows = self.get_rows(contents.splitlines(), delimiter=delimiter)
+        share = {}.setdefault  # Equal values share one string object.
+        trim = trimmer(len(self.headers), excluded_columns)
+        rows = self.get_rows(self.get_lines(contents), delimiter=delimiter)
+        process_row, index_column = self.process_row, self.index_column
+        if type(self).process_row == CSVMixin.process_row:
+            process_row = None  # See CSVMixin.process_file().
         prows = []
         for row in rows:
-            prow = self.process_row(row, comments)
+            if process_row is None:
+                prow = None if not row or row[0].startswith(comments) else row
+            else:
+                prow = process_row(row, comments)
             if prow is None:
                 logger.debug("Skipping row: '%s'" % row)
                 continue
-            prows.append(prow)
-        del contents
+            # Drop the excluded columns now instead of keeping them in memory
+            # until every row has been read and sorted. The word count is
+            # converted once here rather than by the sort key.
+            try:
+                trow = trim(prow)
+            except IndexError:
+                trow = trim_list(prow, excluded_columns)  # A short row.
+            prows.append((int(prow[4]), prow[index_column], trow))
         del rows
-        prows.sort(key=lambda x: int(x[4]), reverse=True)
-        headers.append('number')
-        for n, prow in enumerate(prows, start=1):
-            key = prow[self.index_column]
-            trow = trim_list(prow, excluded_columns)
-            trow.append(str(n))
-            value = dict(zip([self.key_prefix + h for h in headers], trow))
-            update_dict(data, {key: value})
+        prows.sort(key=operator.itemgetter(0), reverse=True)
+        headers = self.get_headers(excluded_columns)
+        number = intern(self.key_prefix + 'number')
+        for n, (count, key, trow) in enumerate(prows, start=1):
+            value = dict(zip(headers, map(share, trow, trow)))
+            value[number] = str(n)
+            if key in data:
+                update_dict(data, {key: value})
+            else:
+                data[key] = value
         del prows
         return data
 
@@ -649,12 +1020,6 @@ class SUBTLEX(CSVMixin, BaseRemoteArchiveSource):
         """
         super(SUBTLEX, self).read()
 
-    def process_row(self, row, comments):
-        """Processes the fields in *row*."""
-        if row[0][0] in comments:
-            return None
-        return row
-
 
 class BaseJunDa(CSVMixin, BaseRemoteSource):
     """A base data source class for Jun Da's character frequency lists.
@@ -679,6 +1044,9 @@ class BaseJunDa(CSVMixin, BaseRemoteSource):
     #: (counting from zero).
     index_column = 1
 
+    #: Whether or not :meth:`read_file` should return an open file object.
+    stream_files = True
+
     def __init__(self, name, cache_data=True, cache_name='dragonmasher',
                  timeout=DEFAULT_TIMEOUT):
         """Creates the :attr:`download_url` and :attr:`name` attributes.
@@ -727,7 +1095,8 @@ class BaseJunDa(CSVMixin, BaseRemoteSource):
         """Processes the Jun Da character frequency file.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :return: The processed data.
         :rtype: :class:`dict`
 
@@ -918,6 +1287,9 @@ class CEDICT(CSVMixin, BaseRemoteArchiveSource):
         'cedict_ts.u8',  # This file is in the ZIP version.
     )
 
+    #: The CC-CEDICT file is large, so it is processed line by line.
+    stream_files = True
+
     def __init__(self, cache_data=True, cache_name='dragonmasher',
                  timeout=DEFAULT_TIMEOUT):
         super(self.__class__, self).__init__(cache_data=cache_data,
@@ -925,18 +1297,34 @@ class CEDICT(CSVMixin, BaseRemoteArchiveSource):
                                              timeout=timeout,
                                              encoding='utf-8')
 
+    def open_file(self, filename):
+        """Opens a CC-CEDICT file so that it can be read line by line.
+
+        Unlike CSV files, CC-CEDICT's lines are parsed as text on Python 2 as
+        well, so the file is always opened in text mode.
+
+        """
+        return io.open(filename, 'r', encoding=self.encoding)
+
     def process_file(self, filename, contents):
         """Processes the CC-CEDICT dictionary file's contents.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :return: The processed data.
         :rtype: :class:`dict`
 
         """
         logger.debug("Processing file: '%s'." % filename)
         data = {}
-        rows = self.get_rows(contents.splitlines())
+        entry_key = intern(self.key_prefix + 'entry')
+        # Definitions like classifiers repeat across many entries, so equal
+        # definitions share a single string object.
+        share = {}.setdefault
+        if not hasattr(contents, 'read'):
+            contents = io.StringIO(contents)
+        rows = self.get_rows(contents)
         for row in rows:
             if len(row) != 4:
                 logger.warning("Skipping line: '%s'." % row)
@@ -946,43 +1334,63 @@ class CEDICT(CSVMixin, BaseRemoteArchiveSource):
                 # Skip lines that process_row couldn't parse or are comments.
                 logger.warning("Skipping row: '%s'." % row)
                 continue
-            value = {self.key_prefix + 'entry': [prow]}
-            update_dict(data, {prow[0]: value})
-            if prow[0] != prow[1]:
-                # Add Simplified if it differs from Traditional.
-                update_dict(data, {prow[1]: value})
+            definitions = prow[3]
+            definitions[:] = map(share, definitions, definitions)
+            # Add Simplified if it differs from Traditional.
+            keys = (prow[0],) if prow[0] == prow[1] else (prow[0], prow[1])
+            for key in keys:
+                entry = data.get(key)
+                if entry is None:
+                    data[key] = {entry_key: [prow]}
+                else:
+                    entry[entry_key].append(prow)
         return data
 
     def get_rows(self, lines):
         for line in lines:
-            m = re.match('^(?P<t>.+) (?P<s>.+) \[(?P<p>.+)\] /(?P<d>.+)/$',
-                         line)
-            if m is None:
+            line = line.rstrip('\r\n')
+            row = self._split_line(line)
+            if row is None:
                 logger.warning("Unable to parse line: '%s'." % line)
                 yield [line]
                 continue
-            t, s, p, d = m.group('t'), m.group('s'), m.group('p'), m.group('d')
-            yield [t, s, p, d]
+            yield row
+
+    def _split_line(self, line):
+        """Splits a CC-CEDICT line into its four fields.
+
+        Most lines contain ``' ['`` and ``'] /'`` exactly once, so they are
+        split with string methods. Any other line is matched against the
+        full regular expression.
+
+        :return: A list of the fields or :data:`None` if *line* couldn't be
+            parsed.
+
+        """
+        i = line.find(' [')
+        j = line.find('] /', i)
+        if (i > 0 and j > i + 2 and len(line) > j + 4 and
+                line.endswith('/') and line.find(' [', i + 1) == -1 and
+                line.find('] /', j + 1) == -1):
+            t, _, s = line[:i].partition(' ')
+            if t and s and ' ' not in s:
+                return [t, s, line[i + 2:j], line[j + 3:-1]]
+        m = _CEDICT_LINE_RE.match(line)
+        if m is None:
+            return None
+        return [m.group('t'), m.group('s'), m.group('p'), m.group('d')]
 
     def process_row(self, row, comments):
         """Processes the fields in *row*."""
-        if row[0][0] in comments:
+        if row[0].startswith(comments):
             logger.info("Skipping comment: '%s'." % row[0])
             return None
-        pinyin_re = re.compile('(?:[a-zA-Z]+[1-5](?: (?=[a-zA-Z]+[1-5]))?)+')
         row[2] = row[2].replace('u:', 'v')
         if ' ' in row[2]:
-            for p in pinyin_re.findall(row[2]):
-                row[2] = row[2].replace(p, p.replace(' ', ''))
-        row[2] = transcriptions.numbered_to_accented(row[2])
+            row[2] = _CEDICT_PINYIN_RE.sub(_join_syllables, row[2])
+        row[2] = _numbered_to_accented(row[2])
         if '[' in row[3]:
-            for pinyin in re.findall('\[[A-Za-z1-5 ]+\]', row[3]):
-                npinyin = pinyin
-                if ' ' in pinyin:
-                    for p in pinyin_re.findall(pinyin):
-                        npinyin = npinyin.replace(p, p.replace(' ', ''))
-                npinyin = transcriptions.numbered_to_accented(npinyin)
-                row[3] = row[3].replace(pinyin, npinyin)
+            row[3] = _CEDICT_BRACKET_RE.sub(_accent_bracketed_pinyin, row[3])
         row[3] = row[3].split('/')
         return row
 
@@ -1017,6 +1425,9 @@ class LWCWords(CSVMixin, BaseRemoteArchiveSource):
         'words_types.txt',
     )
 
+    #: The LWC words file is large, so it is processed line by line.
+    stream_files = True
+
     def __init__(self, cache_data=True, cache_name='dragonmasher',
                  timeout=DEFAULT_TIMEOUT):
         super(self.__class__, self).__init__(cache_data=cache_data,
@@ -1051,7 +1462,8 @@ class LWCWords(CSVMixin, BaseRemoteArchiveSource):
         """Processes a CSV file's contents.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :return: The processed data.
         :rtype: :class:`dict`
 
@@ -1062,35 +1474,43 @@ class LWCWords(CSVMixin, BaseRemoteArchiveSource):
         logger.debug("Processing file: '%s'." % filename)
         excluded_columns = exclude + (self.index_column,)
         data = {}
-        headers = trim_list(self.headers, excluded_columns)
-        if is_python2:
-            contents = contents.encode('utf-8')
-        rows = self.get_rows(contents.splitlines(), delimiter=delimiter)
+        share = {}.setdefault  # Equal values share one string object.
+        trim = trimmer(len(self.headers), excluded_columns)
+        rows = self.get_rows(self.get_lines(contents), delimiter=delimiter)
+        process_row, index_column = self.process_row, self.index_column
         prows = []
         for row in rows:
-            prow = self.process_row(row, comments)
+            prow = process_row(row, comments)
             if prow is None:
                 logger.debug("Skipping row: '%s'" % row)
                 continue
-            prows.append(prow)
-        del contents
+            # Drop the excluded columns now instead of keeping them in memory
+            # until every row has been read and sorted. The word count is
+            # converted once here rather than by the sort key.
+            try:
+                trow = trim(prow)
+            except IndexError:
+                trow = trim_list(prow, excluded_columns)  # A short row.
+            prows.append((int(prow[3]), prow[index_column], trow))
         del rows
-        prows.sort(key=lambda x: int(x[3]), reverse=True)
-        headers.append('number')
-        for n, prow in enumerate(prows, start=1):
-            key = prow[self.index_column]
-            trow = trim_list(prow, excluded_columns)
-            trow.append(str(n))
-            value = dict(zip([self.key_prefix + h for h in headers], trow))
-            update_dict(data, {key: value})
+        prows.sort(key=operator.itemgetter(0), reverse=True)
+        headers = self.get_headers(excluded_columns)
+        number = intern(self.key_prefix + 'number')
+        for n, (count, key, trow) in enumerate(prows, start=1):
+            value = dict(zip(headers, map(share, trow, trow)))
+            value[number] = str(n)
+            if key in data:
+                update_dict(data, {key: value})
+            else:
+                data[key] = value
         del prows
         return data
 
     def process_row(self, row, comments):
         """Processes the fields in *row*."""
-        if row[0][0] in comments:
+        if not row or row[0].startswith(comments):
             return None
-        if not re.search('[%s]' % zhon.hanzi.cjk_ideographs, row[1]):
+        if not _CJK_IDEOGRAPH_RE.search(row[1]):
             # Skip words that don't have Chinese characters.
             return None
         return row
@@ -1116,6 +1536,9 @@ class Unihan(CSVMixin, BaseRemoteArchiveSource):
     #: A unique name/abbreviation for this source.
     name = 'UNIHAN'
 
+    #: The Unihan files are large, so they are processed line by line.
+    stream_files = True
+
     def __init__(self, cache_data=True, cache_name='dragonmasher',
                  timeout=DEFAULT_TIMEOUT):
         super(self.__class__, self).__init__(cache_data=cache_data,
@@ -1149,33 +1572,92 @@ class Unihan(CSVMixin, BaseRemoteArchiveSource):
         """Processes a Unihan data file.
 
         :param str filename: The filename of the file to be processed.
-        :param str contents: The contents to be processed.
+        :param contents: The contents to be processed, either as a string or
+            as an open file object.
         :return: The processed data.
         :rtype: :class:`dict`
 
         """
         logger.debug("Processing file: '%s'." % filename)
         excluded_columns = (self.index_column,)
+        key_prefix = self.key_prefix
         data = {}
-        if is_python2:
-            contents = contents.encode('utf-8')
-        rows = self.get_rows(contents.splitlines(), delimiter='\t')
+        # Values like stroke counts and readings repeat across many
+        # characters, so equal values share a single string object.
+        share = {}.setdefault
+        # The prefixed field names, keyed by the unprefixed names. There are
+        # only a few dozen of them, so each one is built and interned once.
+        fields = {}
+        trim = trimmer(len(self.headers), excluded_columns)
+        rows = self.get_rows(self.get_lines(contents), delimiter='\t')
+        process_row, index_column = self.process_row, self.index_column
         for row in rows:
-            prow = self.process_row(row, ('#',))
+            prow = process_row(row, ('#',))
             if prow is None:
                 logger.debug("Skipping row: '%s'" % row)
                 continue
-            key = row[self.index_column]
-            trow = trim_list(row, excluded_columns)
-            value = {self.key_prefix + trow[0]: trow[1]}
-            update_dict(data, {key: value})
+            key = row[index_column]
+            name, field_value = trim(row)
+            field = fields.get(name)
+            if field is None:
+                field = fields[name] = intern(key_prefix + name)
+            field_value = share(field_value, field_value)
+            character = data.get(key)
+            if character is None:
+                data[key] = {field: field_value}
+            elif field not in character:
+                character[field] = field_value
+            else:
+                update_dict(data, {key: {field: field_value}})
         return data
 
     def process_row(self, row, comments):
         """Processes the fields in *row*."""
-        if not row or row[0][0] in comments:
+        if not row or row[0].startswith(comments):
             return None
-        row[0] = hex_to_chr(row[0][2:])
-        if 'U+' in row[-1]:
-            row[-1] = re.sub('U\+[A-F0-9]*', hex_to_chr, row[-1])
+        row[0] = hex_to_chr(row[0])
+        row[-1] = _UNICODE_POINT_RE.sub(hex_to_chr, row[-1])
         return row
+
+
+def download_all(sources, force_download=False, read=False):
+    """Downloads several remote data sources at the same time.
+
+    Each source's :meth:`download` method is called in its own thread, so the
+    total download time is roughly that of the slowest source instead of the
+    sum of them all. Sources that already have processed data are skipped
+    unless *force_download* is ``True``.
+
+    If *read* is ``True``, each source's :meth:`read` method is also called in
+    its thread as soon as its download finishes. Sources that finish
+    downloading first are then processed while the others are still
+    downloading.
+
+    :param sources: An iterable of remote data source objects (e.g.
+        :class:`SUBTLEX` or :class:`CEDICT`).
+    :param bool force_download: Whether or not to download the source files
+        even if the data is cached.
+    :param bool read: Whether or not to read and process each source's files
+        after downloading them.
+    :raises: The first exception raised by a source's :meth:`download` (or
+        :meth:`read`) method, once every thread has finished.
+
+    """
+    errors = []
+
+    def download(source):
+        try:
+            source.download(force_download=force_download)
+            if read:
+                source.read()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=download, args=(source,))
+               for source in sources if force_download or not source.has_data]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
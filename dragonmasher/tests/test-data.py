@@ -32,3 +32,5 @@ class DataFunctionsTestCase(unittest.TestCase):
         self.assertTrue(2 in mash12a)
         mash13 = data.mash(source1, source3)
         self.assertEqual(data13, mash13)
+        mash132a = data.mash(source1, source3, source2, annotate=True)
+        self.assertEqual(data13, mash132a)
@@ -2,9 +2,11 @@
 """Unit tests for the dragonmasher.sources module."""
 
 from __future__ import unicode_literals
+import io
 import os
 import shutil
 import sys
+import tempfile
 import types
 import unittest
 
@@ -14,9 +16,15 @@ from dragonmasher import sources
 
 is_python3 = sys.version_info[0] > 2
 
-if not is_python3:
+if is_python3:
+    from urllib.request import pathname2url
+else:
+    from urllib import pathname2url
     str = unicode
 
+# The directory containing the test data files.
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
 
 class PackageResourceSourceTestCase(unittest.TestCase):
     """Tests for the package resource source classes.
@@ -49,14 +57,25 @@ class PackageResourceSourceTestCase(unittest.TestCase):
         self.assertEqual('1', xdcyz.data['爱']['XDCYZ-level'])
         self.assertEqual('10', xdcyz.data['爱']['XDCYZ-strokes'])
 
+    def test_read_reuses_data(self):
+        """Tests that later instances get an unshared copy of the data."""
+        hsk = sources.HSK()
+        hsk.read()
+        hsk.data['便宜']['HSK-level'] = 'changed'
+        hsk.data['喂']['HSK-level'].append('changed')
+        other = sources.HSK()
+        other.read()
+        self.assertEqual(4995, len(other.data))
+        self.assertEqual('2', other.data['便宜']['HSK-level'])
+        self.assertEqual(['1', '6'], other.data['喂']['HSK-level'])
+
 
 class BaseRemoteSourceTestCase(unittest.TestCase):
     """Tests for the BaseRemoteSource class."""
 
     def __init__(self, *args, **kwargs):
         """Finds data file."""
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        self.data_file = os.path.join(data_dir, 'remote_source_test.txt')
+        self.data_file = os.path.join(DATA_DIR, 'remote_source_test.txt')
         super(BaseRemoteSourceTestCase, self).__init__(*args, **kwargs)
 
     def setUp(self):
@@ -68,10 +87,7 @@ class BaseRemoteSourceTestCase(unittest.TestCase):
             download_url = 'http://foo.com/remote_source_test.txt'
 
             def _download(self, url, filename):
-                with open(data_file) as f:
-                    data = f.read()
-                with open(filename, 'w') as f:
-                    f.write(data)
+                shutil.copyfile(data_file, filename)
 
             def process_file(self, fname, contents):
                 return {'test': contents}
@@ -103,6 +119,57 @@ class BaseRemoteSourceTestCase(unittest.TestCase):
         self.assertEqual(1, len(self.source.files))
         self.assertTrue(os.path.exists(self.source.files[0]))
 
+    def test_remote_source_download_url(self):
+        """Tests that BaseRemoteSource._download saves the given URL."""
+        self.source.temp_dir = tempfile.mkdtemp()
+        filename = os.path.join(self.source.temp_dir, 'download.txt')
+        url = 'file:' + pathname2url(self.data_file)
+        sources.BaseRemoteSource._download(self.source, url, filename)
+        with open(filename) as f:
+            self.assertEqual('Hello world!\n', f.read())
+
+    def test_remote_source_download_resume(self):
+        """Tests that BaseRemoteSource._download resumes downloads."""
+        ranges = []
+
+        class Page(object):
+            def __init__(self, chunks, code):
+                self.chunks = chunks
+                self.code = code
+
+            def read(self, size=-1):
+                if not self.chunks:
+                    return b''
+                chunk = self.chunks.pop(0)
+                if isinstance(chunk, Exception):
+                    raise chunk
+                return chunk
+
+            def getcode(self):
+                return self.code
+
+            def close(self):
+                pass
+
+        def urlopen(request):
+            ranges.append(request.get_header('Range'))
+            if len(ranges) == 1:
+                return Page([b'Hello ', IOError('Connection reset')], 200)
+            return Page([b'world!\n'], 206)
+
+        self.source.temp_dir = tempfile.mkdtemp()
+        filename = os.path.join(self.source.temp_dir, 'download.txt')
+        _urlopen = sources.urlopen
+        sources.urlopen = urlopen
+        try:
+            sources.BaseRemoteSource._download(self.source, 'http://foo.com',
+                                               filename)
+        finally:
+            sources.urlopen = _urlopen
+        self.assertEqual([None, 'bytes=6-'], ranges)
+        with open(filename) as f:
+            self.assertEqual('Hello world!\n', f.read())
+
     def test_remote_source_read_(self):
         """Tests that BaseRemoteSource.read works correctly."""
         self.assertRaises(OSError, self.source.read)
@@ -132,14 +199,47 @@ class BaseRemoteSourceTestCase(unittest.TestCase):
         self.assertEqual(None, self.source.files)
         self.assertEqual('Hello world!\n', self.source.data['test'])
 
+    def test_remote_source_force_download(self):
+        """Tests that BaseRemoteSource.download resets the cached data."""
+        self.source.cache_data = True
+        self.source._init_cache('dragonmasher-tests', 10)
+        self.source.download()
+        self.source.read()
+        self.source.download(force_download=True)
+        self.assertEqual({}, self.source.data)
+        self.assertFalse(self.source.name in self.source.cache)
+        self.assertEqual(1, len(self.source.files))
+        self.source.read()
+        self.assertEqual('Hello world!\n',
+                         self.source.cache[self.source.name]['test'])
+
+    def test_download_all(self):
+        """Tests that download_all downloads every source."""
+        other = type(self.source)(cache_data=False)
+        try:
+            sources.download_all((self.source, other))
+            self.assertEqual(1, len(self.source.files))
+            self.assertEqual(1, len(other.files))
+            self.assertNotEqual(self.source.files, other.files)
+        finally:
+            if other.temp_dir is not None:
+                other._cleanup()
+
+    def test_download_all_read(self):
+        """Tests that download_all can read every source it downloads."""
+        other = type(self.source)(cache_data=False)
+        sources.download_all((self.source, other), read=True)
+        self.assertEqual('Hello world!\n', self.source.data['test'])
+        self.assertEqual('Hello world!\n', other.data['test'])
+        self.assertEqual(None, other.temp_dir)
+
 
 class BaseRemoteArchiveSourceTestCase(unittest.TestCase):
     """Tests for the BaseRemoteArchiveSource class."""
 
     def __init__(self, *args, **kwargs):
         """Finds data file."""
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        self.data_file = os.path.join(data_dir, 'remote_archive_test.zip')
+        self.data_file = os.path.join(DATA_DIR, 'remote_archive_test.zip')
         self.filename = 'remote_source_test.txt'
         super(BaseRemoteArchiveSourceTestCase, self).__init__(*args, **kwargs)
 
@@ -152,10 +252,7 @@ class BaseRemoteArchiveSourceTestCase(unittest.TestCase):
             download_url = 'http://foo.com/remote_archive_test.zip'
 
             def _download(self, url, filename):
-                with open(data_file, 'rb') as f:
-                    data = f.read()
-                with open(filename, 'wb') as f:
-                    f.write(data)
+                shutil.copyfile(data_file, filename)
 
         self.source = RemoteArchiveSource(cache_data=False)
 
@@ -180,7 +277,7 @@ class SUBTLEXTestCase(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         self.data_file = os.path.join(self.data_dir, 'subtlex_words_test.txt')
         super(SUBTLEXTestCase, self).__init__(*args, **kwargs)
 
@@ -202,6 +299,16 @@ class SUBTLEXTestCase(unittest.TestCase):
         self.assertEqual('1', self.subtlex.data['的']['SUBTLEX-length'])
         self.assertEqual('1', self.subtlex.data['的']['SUBTLEX-number'])
 
+    def test_subtlex_ranks(self):
+        """Tests that SUBTLEX ranks words by count, keeping ties in order."""
+        fields = ['1', 'x', 'x', '%s'] + ['0'] * 11
+        lines = ['\t'.join([word] + fields) % count for word, count in
+                 (('a', 5), ('b', 10), ('c', 5), ('d', 20))]
+        data = self.subtlex.process_file('words.txt', '\n'.join(lines))
+        self.assertEqual(['d', 'b', 'a', 'c'],
+                         sorted(data, key=lambda k: int(
+                             data[k]['SUBTLEX-number'])))
+
 
 class CSVMixinTestCase(unittest.TestCase):
     """Unit tests for the CSVMixin class."""
@@ -218,6 +325,8 @@ class CSVMixinTestCase(unittest.TestCase):
         row = ['#Comment', 'here']
         self.assertEqual(None, self.csvmixin.process_row(row, ('#',)))
 
+        self.assertEqual(None, self.csvmixin.process_row([], ('#',)))
+
     def test_get_rows(self):
         """Tests that CSVMixin.get_rows works correctly."""
         lines = ['A,B,C', 'D,E,F']
@@ -225,6 +334,21 @@ class CSVMixinTestCase(unittest.TestCase):
         rows = self.csvmixin.get_rows(lines)
         self.assertEqual(erows, list(rows))
 
+        lines = ['A\t"B', 'C\tD']
+        erows = [['A', '"B'], ['C', 'D']]
+        rows = self.csvmixin.get_rows(lines, delimiter='\t')
+        self.assertEqual(erows, list(rows))
+
+    def test_get_headers(self):
+        """Tests that CSVMixin.get_headers works correctly."""
+        self.csvmixin.headers = ('Letter', 'Number', 'Foo')
+        self.csvmixin.key_prefix = 'CSV-'
+        headers = self.csvmixin.get_headers((0, 2))
+        self.assertEqual(('CSV-Number',), headers)
+        self.assertTrue(headers is self.csvmixin.get_headers((0, 2)))
+        self.assertEqual(('CSV-Letter', 'CSV-Number', 'CSV-Foo'),
+                         self.csvmixin.get_headers())
+
     def test_process_file(self):
         """Tests that CSVMixin.process_file works correctly."""
         self.csvmixin.headers = ('Letter', 'Number', 'Foo')
@@ -235,13 +359,22 @@ class CSVMixinTestCase(unittest.TestCase):
         data = self.csvmixin.process_file('foo.txt', contents, exclude=(2,))
         self.assertEqual(edata, data)
 
+    def test_process_file_object(self):
+        """Tests that CSVMixin.process_file accepts a file object."""
+        self.csvmixin.headers = ('Letter', 'Number', 'Foo')
+        self.csvmixin.key_prefix = 'CSV-'
+        contents = io.StringIO('a,1,bar\nb,2,bar\n')
+        edata = {'a': {'CSV-Number': '1'}, 'b': {'CSV-Number': '2'}}
+        data = self.csvmixin.process_file('foo.txt', contents, exclude=(2,))
+        self.assertEqual(edata, data)
+
 
 class CEDICTTestCase(unittest.TestCase):
     """Tests for the CEDICT data source class."""
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         self.data_file = os.path.join(self.data_dir, 'cedict_test.txt')
         super(CEDICTTestCase, self).__init__(*args, **kwargs)
 
@@ -269,6 +402,18 @@ class CEDICTTestCase(unittest.TestCase):
                           'length/long/forever/always/constantly'],
                          rows_list[1])
 
+    def test_split_line(self):
+        """Tests that CEDICT._split_line agrees with the line regex."""
+        lines = ('長 长 [chang2] /length/long/',
+                 '中 中 [zhong1] /middle [of] /x/',
+                 '一 二 三 [yi1] /one/',
+                 '一 一 [yi1] //',
+                 '# comment')
+        for line in lines:
+            m = sources._CEDICT_LINE_RE.match(line)
+            expected = None if m is None else list(m.groups())
+            self.assertEqual(expected, self.cedict._split_line(line))
+
     def test_cedict_process_row(self):
         """Tests that CEDICT.process_row works correctly."""
         row = ['長', '长', 'chang2', 'length/long/forever/always/constantly']
@@ -286,6 +431,8 @@ class CEDICTTestCase(unittest.TestCase):
         self.assertEqual(3, len(self.cedict.data))
         self.assertEqual('shǔ', self.cedict.data['钃']['CEDICT-entry'][0][2])
         self.assertEqual('长', self.cedict.data['長']['CEDICT-entry'][0][1])
+        self.assertEqual(2, len(self.cedict.data['長']['CEDICT-entry']))
+        self.assertEqual(2, len(self.cedict.data['长']['CEDICT-entry']))
 
 
 class BaseJunDaTestCase(unittest.TestCase):
@@ -293,7 +440,7 @@ class BaseJunDaTestCase(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         self.data_file = os.path.join(self.data_dir, 'junda_test.txt')
         super(BaseJunDaTestCase, self).__init__(*args, **kwargs)
 
@@ -331,7 +478,7 @@ class LWCWordsTestCase(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         self.data_file = os.path.join(self.data_dir, 'lwc_words_test.txt')
         super(self.__class__, self).__init__(*args, **kwargs)
 
@@ -355,13 +502,24 @@ class LWCWordsTestCase(unittest.TestCase):
         self.assertEqual('1', self.lwc.data['揭露']['LWC-number'])
         self.assertFalse('LWC-reverse-of-word' in self.lwc.data['揭露'])
 
+    def test_ranks(self):
+        """Tests that LWCWords ranks words by their numeric count."""
+        lines = ['"%d","%s","","%s"' % (i, word, count) for i, (word, count)
+                 in enumerate((('揭露', '9'), ('中国', '10'), ('汉字', '100')))]
+        data = self.lwc.process_file('words_types.txt',
+                                     '\n'.join(lines + ['', '# comment']))
+        self.assertEqual(3, len(data))
+        self.assertEqual('1', data['汉字']['LWC-number'])
+        self.assertEqual('2', data['中国']['LWC-number'])
+        self.assertEqual('3', data['揭露']['LWC-number'])
+
 
 class UnihanTestCase(unittest.TestCase):
     """Tests for the Unihan data source class."""
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         self.data_files = [os.path.join(self.data_dir, f) for f in
                            ('unihan_variants_test.txt',
                             'unihan_readings_test.txt')]
@@ -386,3 +544,19 @@ class UnihanTestCase(unittest.TestCase):
                          self.unihan.data['\u34E8']['UNIHAN-kCantonese'])
         self.assertEqual(
             '\u523E', self.unihan.data['\u34E8']['UNIHAN-kSimplifiedVariant'])
+
+    def test_read_processes(self):
+        """Tests that Unihan's files can be processed in parallel."""
+        self.unihan.read()
+        unihan = sources.Unihan(cache_data=False)
+        unihan.files = self.data_files
+        unihan._cleanup = lambda: None
+        unihan.processes = 2
+        unihan.read()
+        self.assertEqual(self.unihan.data, unihan.data)
+
+    def test_process_row(self):
+        """Tests that Unihan converts only complete code points."""
+        row = ['U+34E8', 'kSemanticVariant', 'U+523E<kMatthews U+']
+        self.assertEqual(['\u34E8', 'kSemanticVariant', '\u523E<kMatthews U+'],
+                         self.unihan.process_row(row, ('#',)))
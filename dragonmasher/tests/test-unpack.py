@@ -7,6 +7,9 @@ import unittest
 
 from dragonmasher.unpack import unpack_archive
 
+# The directory containing the test data files.
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
 
 class UnpackArchiveTestCase(unittest.TestCase):
     """Tests for the dragonmasher.unpack module."""
@@ -16,7 +19,7 @@ class UnpackArchiveTestCase(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
         """Sets the data_dir attribute."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.data_dir = DATA_DIR
         super(UnpackArchiveTestCase, self).__init__(*args, **kwargs)
 
     def setUp(self):
@@ -48,3 +51,16 @@ class UnpackArchiveTestCase(unittest.TestCase):
     def test_unpack_archive_zip(self):
         """Tests that unpack_archive correctly unpacks a zip archive file."""
         self._test_unpack_archive('.zip')
+
+    def test_unpack_archive_names(self):
+        """Tests that unpack_archive only unpacks the files in names."""
+        for file_extension in ('.tar', '.tar.gz', '.zip'):
+            archive_file = os.path.join(self.data_dir, 'unpack_test' +
+                                        file_extension)
+            unpack_archive(archive_file, self.temp_dir, names=('other.txt',))
+            self.assertEqual([], os.listdir(self.temp_dir))
+            unpack_archive(archive_file, self.temp_dir,
+                           names=(self.expected_file_name,))
+            self.assertEqual([self.expected_file_name],
+                             os.listdir(self.temp_dir))
+            os.remove(os.path.join(self.temp_dir, self.expected_file_name))
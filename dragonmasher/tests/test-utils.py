@@ -14,6 +14,7 @@ class UtilsFunctionsTestCase(unittest.TestCase):
     def test_hex_to_chr(self):
         """Tests that hex_to_chr works correctly."""
         self.assertEqual('㓨', utils.hex_to_chr('U+34E8'))
+        self.assertEqual('㓨', utils.hex_to_chr('34E8'))
         self.assertEqual('㓨',
                          re.sub('U\+[A-F0-9]*', utils.hex_to_chr, 'U+34E8'))
 
@@ -26,6 +27,15 @@ class UtilsFunctionsTestCase(unittest.TestCase):
         L1_actual = utils.trim_list(L1, excluded)
         self.assertEqual(L1_expected, L1_actual)
 
+    def test_trimmer(self):
+        """Tests that trimmer works correctly."""
+        L1 = [0, 1, 2, 3, 4, 5, 6]
+        excluded = [0, 3, 5]
+        self.assertEqual((1, 2, 4, 6), utils.trimmer(len(L1), excluded)(L1))
+        self.assertEqual((1,), utils.trimmer(2, [0])(L1))
+        self.assertEqual((), utils.trimmer(1, [0])(L1))
+        self.assertRaises(IndexError, utils.trimmer(8, excluded), L1)
+
     def test_update_dict(self):
         """Tests that update_dict works correctly."""
         d1 = {'1': {'1': '1'}}
@@ -48,6 +58,12 @@ class UtilsFunctionsTestCase(unittest.TestCase):
         utils.update_dict(d22, d22copy, allow_duplicates=True)
         self.assertEqual({'2': {'2': ['2', '2']}}, d22)
 
+        # New keys get a copy of other's dictionary.
+        d5 = {}
+        utils.update_dict(d5, d2)
+        self.assertEqual(d2, d5)
+        self.assertFalse(d5['2'] is d2['2'])
+
     def test_update_dict_annotate(self):
         """Tests that update_dict handles the *annotate* argument correctly."""
         d1 = {'1': {'1': '1'}}
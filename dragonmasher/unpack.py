@@ -5,6 +5,7 @@ This module is copied from the Python 3.2 standard library.
 """
 
 import os
+import shutil
 
 
 class ReadError(EnvironmentError):
@@ -18,7 +19,12 @@ def _ensure_directory(path):
         os.makedirs(dirname)
 
 
-def _unpack_zipfile(filename, extract_dir):
+def _wanted(name, names):
+    """Whether or not the member `name` should be unpacked"""
+    return names is None or name.rstrip('/').split('/')[-1] in names
+
+
+def _unpack_zipfile(filename, extract_dir, names=None):
     """Unpack zip `filename` to `extract_dir`"""
     try:
         import zipfile
@@ -38,34 +44,38 @@ def _unpack_zipfile(filename, extract_dir):
                 continue
 
             target = os.path.join(extract_dir, *name.split('/'))
-            if not target:
+            if not target or not _wanted(name, names):
                 continue
 
             _ensure_directory(target)
             if not name.endswith('/'):
                 # file
-                data = zip.read(info.filename)
+                source = zip.open(info)
                 f = open(target, 'wb')
                 try:
-                    f.write(data)
+                    shutil.copyfileobj(source, f)
                 finally:
                     f.close()
-                    del data
+                    source.close()
     finally:
         zip.close()
 
 
-def _unpack_tarfile(filename, extract_dir):
+def _unpack_tarfile(filename, extract_dir, names=None):
     """Unpack tar/tar.gz/tar.bz2 `filename` to `extract_dir`"""
     import tarfile
 
     try:
-        tarobj = tarfile.open(filename)
+        # Read the archive as a stream, so that a compressed archive isn't
+        # decompressed once to list its members and again to extract them.
+        tarobj = tarfile.open(filename, 'r|*')
     except tarfile.TarError:
         raise ReadError(
             "%s is not a compressed or uncompressed tar file" % filename)
     try:
-        tarobj.extractall(extract_dir)
+        for member in tarobj:
+            if _wanted(member.name, names):
+                tarobj.extract(member, extract_dir)
     finally:
         tarobj.close()
 
@@ -85,7 +95,7 @@ def _find_unpack_format(filename):
     return None
 
 
-def unpack_archive(filename, extract_dir=None, format=None):
+def unpack_archive(filename, extract_dir=None, format=None, names=None):
     """Unpack an archive.
 
     If *format* is not provided, :func:`unpack_archive` will use the filename
@@ -97,6 +107,8 @@ def unpack_archive(filename, extract_dir=None, format=None):
         is unpacked. If not provided, the current working directory is used.
     :param str format: The archive format (one of ``'zip'``, ``'tar'``, or
         ``'gztar'``)
+    :param names: A sequence of base names. If provided, only the archive's
+        files with these names are unpacked instead of all of them.
 
     """
     if extract_dir is None:
@@ -109,7 +121,7 @@ def unpack_archive(filename, extract_dir=None, format=None):
             raise ValueError("Unknown unpack format '{0}'".format(format))
 
         func = format_info[1]
-        func(filename, extract_dir, **dict(format_info[2]))
+        func(filename, extract_dir, names=names, **dict(format_info[2]))
     else:
         # we need to look at the registered unpackers supported extensions
         format = _find_unpack_format(filename)
@@ -118,4 +130,4 @@ def unpack_archive(filename, extract_dir=None, format=None):
 
         func = _UNPACK_FORMATS[format][1]
         kwargs = dict(_UNPACK_FORMATS[format][2])
-        func(filename, extract_dir, **kwargs)
+        func(filename, extract_dir, names=names, **kwargs)
@@ -2,13 +2,19 @@
 """Utility functions for dragonmasher."""
 
 from __future__ import unicode_literals
+import operator
 import sys
 
 is_python3 = sys.version_info[0] > 2
 
-if not is_python3:
+if is_python3:
+    unichr = chr
+else:
     str = unicode
 
+# A default for dict.get() that can't be confused with a stored value.
+_MISSING = object()
+
 
 def hex_to_chr(h):
     """Covert strings like 'U+4E5D' to corresponding Unicode characters.
@@ -16,17 +22,39 @@ def hex_to_chr(h):
     This function also works with regular expression match objects.
 
     """
-    if hasattr(h, 'group'):
+    if not isinstance(h, (str, bytes)):
         h = h.group()
-    ordinal = int(h.strip('U+'), 16)
-    return chr(ordinal) if is_python3 else unichr(ordinal)
+    return unichr(int(h.lstrip('U+'), 16))
 
 
 def trim_list(L, excluded):
-    """Removes unwanted itmes from a list."""
+    """Removes unwanted itmes from a list.
+
+    *excluded* is a sequence of the indexes to remove. It is converted to a
+    set first, so each item is checked in constant time.
+
+    """
+    excluded = frozenset(excluded)
     return [item for i, item in enumerate(L) if i not in excluded]
 
 
+def trimmer(length, excluded):
+    """Returns a function that removes unwanted items from a list.
+
+    The function works like :func:`trim_list` for lists with *length* items,
+    but it picks the wanted items with :func:`operator.itemgetter` and returns
+    them as a tuple. It raises :exc:`IndexError` for shorter lists.
+
+    """
+    keep = [i for i in range(length) if i not in excluded]
+    if len(keep) == 0:
+        return lambda L: ()
+    elif len(keep) == 1:
+        index = keep[0]
+        return lambda L: (L[index],)
+    return operator.itemgetter(*keep)
+
+
 def update_dict(d, other, allow_duplicates=False, annotate=False):
     """Updates a dict *d* with the key/value pairs from *other*.
 
@@ -48,28 +76,29 @@ def update_dict(d, other, allow_duplicates=False, annotate=False):
 
     """
     for key, value in other.items():
-        if key not in d and annotate is True:
+        entry = d.get(key, _MISSING)
+        if entry is _MISSING:
+            if annotate is True:
+                continue
+            d[key] = dict(value) if isinstance(value, dict) else value
             continue
-        d.setdefault(key, {})
-        overlap = bool(set(list(d[key])).intersection(set(list(value))))
-        if not overlap:
-            if isinstance(value, dict):
-                d[key].update(value)
-            else:
-                d[key] = value
+        elif not isinstance(value, dict):
+            d[key] = value
             continue
         for k, v in value.items():
-            if k not in d[key]:
-                d[key][k] = v
+            dvalue = entry.get(k, _MISSING)
+            if dvalue is _MISSING:
+                entry[k] = v
                 continue
-            dvalue = d[key][k]
-            if (((isinstance(dvalue, list) and v in dvalue) or
-                    (isinstance(dvalue, str) and v == dvalue)) and
-                    allow_duplicates is False):
+            if isinstance(dvalue, list):
+                if allow_duplicates is False and v in dvalue:
+                    continue
+            elif (allow_duplicates is False and v == dvalue and
+                    isinstance(dvalue, str)):
                 continue
-            elif not isinstance(dvalue, list):
-                d[key][k] = [dvalue]
+            else:
+                dvalue = entry[k] = [dvalue]
             if isinstance(v, list):
-                d[key][k].extend(v)
+                dvalue.extend(v)
             else:
-                d[key][k].append(v)
+                dvalue.append(v)